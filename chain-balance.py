@@ -1,120 +1,385 @@
 #!/usr/bin/env python3
 
+import argparse
+import asyncio
+import functools
+import os
 import subprocess
 import sys
 import json
 
+# orjson parses the (potentially large) CLI output considerably faster than the
+# standard library; its JSONDecodeError subclasses json.JSONDecodeError.
+try:
+    import orjson
+
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+# With ijson the channel list is consumed one channel at a time straight from the
+# lncli pipe, instead of buffering and decoding the whole listchannels output.
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Talk to tapd/lnd over gRPC when grpcio and the generated taprpc/lnrpc stubs
+# are importable, otherwise fall back to the tapcli/lncli binaries.
+try:
+    import grpc
+    import lightning_pb2 as lnrpc
+    import lightning_pb2_grpc as lnrpc_grpc
+    import taprootassets_pb2 as taprpc
+    import taprootassets_pb2_grpc as taprpc_grpc
+
+    # lnd and tapd certificates use ECDSA keys
+    os.environ.setdefault("GRPC_SSL_CIPHER_SUITES", "HIGH+ECDSA")
+except ImportError:
+    grpc = None
+
+# Connection defaults, matching the ones tapcli and lncli use. Paths are expanded
+# once here; subprocess does not expand "~" itself.
+TAPD_RPCSERVER = "localhost:8443"
+TAPD_TLS_CERT = os.path.expanduser("~/.lit/tls.cert")
+TAPD_MACAROON = os.path.expanduser("~/.tapd/data/{network}/admin.macaroon")
+LND_RPCSERVER = "localhost:10009"
+LND_TLS_CERT = os.path.expanduser("~/.lnd/tls.cert")
+LND_MACAROON = os.path.expanduser("~/.lnd/data/chain/bitcoin/{network}/admin.macaroon")
+
+# Invariant command prefixes
+TAPCLI_BASE = (
+    "tapcli",
+    "--tlscertpath",
+    TAPD_TLS_CERT,
+    f"--rpcserver={TAPD_RPCSERVER}",
+)
+LNCLI_BASE = ("lncli",)
+
+# Upper bound on tapcli/lncli processes or gRPC calls in flight at once, so that
+# querying many identifiers does not overwhelm the node
+MAX_CONCURRENT_RPCS = 8
+
 
-def run_command(command):
+@functools.lru_cache(maxsize=None)
+def _rpc_semaphore():
     """
-    Runs a command using subprocess and returns the JSON-decoded output.
+    Returns the semaphore bounding concurrent queries. It is created on first use
+    from inside the running event loop, since before Python 3.10 a semaphore binds
+    to the loop that is current when it is created.
     """
+    return asyncio.Semaphore(MAX_CONCURRENT_RPCS)
+
+
+class CommandError(Exception):
+    """
+    Raised when a command fails or its output cannot be parsed. It is reported once
+    the event loop has shut down, since exiting from inside a task leaves the other
+    pending queries behind.
+    """
+
+
+async def run_command_async(command):
+    """
+    Runs a command as an asyncio subprocess and returns the JSON-decoded output.
+    """
+    async with _rpc_semaphore():
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except OSError as e:
+            raise CommandError(f"Error running command: {e}") from e
+
+        stdout, stderr = await proc.communicate()
+
+    if proc.returncode != 0:
+        raise CommandError(
+            f"Error running command: Command '{command}' returned non-zero exit status {proc.returncode}."
+        )
+
     try:
-        result = subprocess.run(command, capture_output=True, text=True, check=True)
-        return json.loads(result.stdout)
-    except subprocess.CalledProcessError as e:
-        print(f"Error running command: {e}")
-        sys.exit(1)
+        return json_loads(stdout)
     except json.JSONDecodeError as e:
-        print(f"Error parsing JSON output: {e}")
-        sys.exit(1)
+        raise CommandError(f"Error parsing JSON output: {e}") from e
 
 
-def get_onchain_balance(identifier, id_type, network):
+@functools.lru_cache(maxsize=None)
+def _run_command_cached(command):
     """
-    Retrieves and returns the total on-chain balance for the given identifier.
+    Schedules a command at most once per process and returns the task producing its
+    JSON-decoded output. The command must be a tuple so that it can be hashed.
     """
-    asset_list_command = [
-        "tapcli",
-        "--tlscertpath",
-        "~/.lit/tls.cert",
-        f"--rpcserver=localhost:8443",
-        f"--network={network}",
-        "assets",
-        "list",
-    ]
+    return asyncio.ensure_future(run_command_async(list(command)))
 
-    data = run_command(asset_list_command)
 
-    # Initialize a variable to hold the total balance
-    total_balance = 0
+async def _run_in_thread(func, *args):
+    """
+    Runs a blocking helper (a gRPC call or a streamed subprocess) in a worker thread.
+    """
+    async with _rpc_semaphore():
+        return await asyncio.to_thread(func, *args)
 
-    # Extract and sum the balances
-    for asset in data.get("assets", []):
-        asset_id = asset.get("asset_genesis", {}).get("asset_id")
-        script_key_is_local = asset.get("script_key_is_local", False)
-        asset_group = asset.get("asset_group", {})
 
-        # Ensure asset_group is not None
-        if asset_group:
-            raw_group_key = asset_group.get("raw_group_key")
-            tweaked_group_key = asset_group.get("tweaked_group_key")
+@functools.lru_cache(maxsize=None)
+def _run_in_thread_cached(func, *args):
+    """
+    Schedules a blocking helper at most once per process for the given arguments and
+    returns the task producing its result.
+    """
+    return asyncio.ensure_future(_run_in_thread(func, *args))
+
+
+@functools.lru_cache(maxsize=None)
+def _ssl_credentials(tls_cert_path):
+    """
+    Reads and parses a TLS certificate once and returns the shared gRPC credentials.
+    """
+    with open(tls_cert_path, "rb") as f:
+        return grpc.ssl_channel_credentials(f.read())
+
+
+@functools.lru_cache(maxsize=None)
+def _grpc_channel(rpcserver, tls_cert_path, macaroon_path):
+    """
+    Opens an authenticated gRPC channel, reused for every call to the same server.
+    """
+    ssl_creds = _ssl_credentials(tls_cert_path)
+    with open(macaroon_path, "rb") as f:
+        macaroon = f.read().hex()
+
+    def metadata_callback(context, callback):
+        callback([("macaroon", macaroon)], None)
+
+    auth_creds = grpc.metadata_call_credentials(metadata_callback)
+    return grpc.secure_channel(
+        rpcserver, grpc.composite_channel_credentials(ssl_creds, auth_creds)
+    )
+
+
+def _grpc_list_assets(channel):
+    """
+    Calls tapd's ListAssets RPC and returns the fields used by this script in the
+    same shape as the `tapcli assets list` output.
+    """
+    response = taprpc_grpc.TaprootAssetsStub(channel).ListAssets(
+        taprpc.ListAssetRequest()
+    )
+
+    assets = []
+    for asset in response.assets:
+        if asset.HasField("asset_group"):
+            asset_group = {
+                "raw_group_key": asset.asset_group.raw_group_key.hex(),
+                "tweaked_group_key": asset.asset_group.tweaked_group_key.hex(),
+            }
         else:
-            raw_group_key = None
-            tweaked_group_key = None
-
-        # If identifier is an asset ID, check for asset ID match
-        if id_type == "asset_id" and asset_id == identifier:
-            if script_key_is_local:
-                amount = int(asset.get("amount", 0))
-                total_balance += amount
-
-        # If identifier is a group key, check for raw or tweaked group key match
-        elif id_type == "group_key" and (
-            raw_group_key == identifier or tweaked_group_key == identifier
-        ):
-            if script_key_is_local:
-                amount = int(asset.get("amount", 0))
-                total_balance += amount
+            asset_group = None
+
+        assets.append(
+            {
+                "asset_genesis": {"asset_id": asset.asset_genesis.asset_id.hex()},
+                "amount": asset.amount,
+                "script_key_is_local": asset.script_key_is_local,
+                "asset_group": asset_group,
+            }
+        )
 
-    if total_balance > 0:
-        print(f"Found on-chain balance")
-    else:
-        print(
-            f"No on-chain balance information found for {id_type} {identifier} on {network}."
+    return {"assets": assets}
+
+
+def _grpc_list_channels(channel, active_only=False):
+    """
+    Calls lnd's ListChannels RPC and returns the custom channel data in the same
+    shape as the `lncli listchannels` output.
+    """
+    response = lnrpc_grpc.LightningStub(channel).ListChannels(
+        lnrpc.ListChannelsRequest(active_only=active_only)
+    )
+
+    # With tapd as the aux data parser, lnd returns custom channel data as JSON
+    channels = []
+    for chan in response.channels:
+        if chan.custom_channel_data:
+            channels.append(
+                {"custom_channel_data": json_loads(chan.custom_channel_data)}
+            )
+
+    return {"channels": channels}
+
+
+def _use_grpc(tls_cert_path, macaroon_path):
+    """
+    Returns whether to query a node over gRPC: the stubs must be importable and the
+    default credentials present. Otherwise the CLI, which may be configured with
+    other credentials, is used.
+    """
+    return (
+        grpc is not None
+        and os.path.isfile(tls_cert_path)
+        and os.path.isfile(macaroon_path)
+    )
+
+
+async def _grpc_call(func, rpcserver, tls_cert_path, macaroon_path, *args):
+    """
+    Runs a gRPC helper once per process and returns its result, turning RPC and
+    credential failures into a CommandError. The channel is opened here, on the
+    event loop thread, so concurrent queries share it instead of racing to create
+    their own.
+    """
+    try:
+        channel = _grpc_channel(rpcserver, tls_cert_path, macaroon_path)
+        return await _run_in_thread_cached(func, channel, *args)
+    except grpc.RpcError as e:
+        details = e.details() if isinstance(e, grpc.Call) else e
+        raise CommandError(f"Error calling RPC: {details}") from e
+    except OSError as e:
+        raise CommandError(f"Error calling RPC: {e}") from e
+
+
+async def fetch_assets(network):
+    """
+    Returns the asset list of the tapd node, using gRPC if available and tapcli
+    otherwise.
+    """
+    macaroon_path = TAPD_MACAROON.format(network=network)
+    if _use_grpc(TAPD_TLS_CERT, macaroon_path):
+        return await _grpc_call(
+            _grpc_list_assets, TAPD_RPCSERVER, TAPD_TLS_CERT, macaroon_path
         )
 
-    return total_balance
+    asset_list_command = (*TAPCLI_BASE, f"--network={network}", "assets", "list")
+    return await _run_command_cached(asset_list_command)
 
 
-def get_off_chain_balances(identifier, id_type, network, asset_ids=None):
+def _stream_channel_index(command):
+    """
+    Runs lncli and builds the channel index while parsing its output incrementally,
+    so only one channel is held in memory at a time.
     """
-    Retrieves and returns the total off-chain capacity, local balance, and remote balance
-    for the given identifier. If the identifier is a group key, it uses the list of asset IDs.
+    with subprocess.Popen(
+        command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    ) as proc:
+        try:
+            index = build_channel_index(ijson.items(proc.stdout, "channels.item"))
+        except ijson.JSONError:
+            # A failing lncli leaves its output empty or truncated, so report the
+            # exit status rather than the parse error in that case
+            proc.stdout.close()
+            if proc.wait() != 0:
+                raise subprocess.CalledProcessError(proc.returncode, list(command))
+            raise
+
+    if proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, list(command))
+
+    return index
+
+
+async def fetch_channel_index(network, active_only=False):
     """
-    channel_balance_command = ["lncli", f"--network={network}", "listchannels"]
+    Returns the channel index (see `build_channel_index`) of the lnd node, using
+    gRPC if available and lncli otherwise. With active_only, lnd filters out
+    inactive channels server-side.
+    """
+    macaroon_path = LND_MACAROON.format(network=network)
+    if _use_grpc(LND_TLS_CERT, macaroon_path):
+        data = await _grpc_call(
+            _grpc_list_channels,
+            LND_RPCSERVER,
+            LND_TLS_CERT,
+            macaroon_path,
+            active_only,
+        )
+        return build_channel_index(data["channels"])
 
-    data = run_command(channel_balance_command)
+    channel_balance_command = (*LNCLI_BASE, f"--network={network}", "listchannels")
+    if active_only:
+        channel_balance_command += ("--active_only",)
+
+    if ijson is not None:
+        try:
+            return await _run_in_thread_cached(
+                _stream_channel_index, channel_balance_command
+            )
+        except (OSError, subprocess.CalledProcessError) as e:
+            raise CommandError(f"Error running command: {e}") from e
+        except ijson.JSONError as e:
+            raise CommandError(f"Error parsing JSON output: {e}") from e
 
-    total_capacity = 0
-    total_local_balance = 0
-    total_remote_balance = 0
+    data = await _run_command_cached(channel_balance_command)
+    return build_channel_index(data.get("channels", ()))
 
-    # Determine if we're working with a single asset ID or a list of asset IDs
-    identifiers_to_check = [identifier] if id_type == "asset_id" else asset_ids
 
-    # Process each channel in the list
-    for channel in data.get("channels", []):
-        # Check for custom_channel_data
-        custom_data = channel.get("custom_channel_data", {})
+def get_onchain_balance_single(data, asset_id):
+    """
+    Returns the on-chain balance of a single asset ID from the `tapcli assets list`
+    output, counting only assets whose script key is local.
+    """
+    total_balance = 0
+
+    # Only the asset ID needs comparing, group keys never match a single asset
+    for asset in data.get("assets", []):
+        if asset.get("script_key_is_local", False) and (
+            asset.get("asset_genesis", {}).get("asset_id") == asset_id
+        ):
+            total_balance += int(asset.get("amount", 0))
+
+    return total_balance
+
+
+def build_channel_index(channels):
+    """
+    Walks the channels of the `lncli listchannels` output once and returns a mapping
+    of asset ID to its (capacity, local balance, remote balance) summed across all
+    channels.
+    """
+    index = {}
+
+    for channel in channels:
+        custom_data = channel.get("custom_channel_data")
         if not custom_data:
             continue  # Skip this channel if no custom_channel_data is found
 
-        # Iterate over the assets in custom_channel_data
-        for asset in custom_data.get("assets", []):
+        for asset in custom_data.get("assets", ()):
             asset_id = (
                 asset.get("asset_utxo", {}).get("asset_genesis", {}).get("asset_id")
             )
-            if asset_id in identifiers_to_check:
-                # If asset ID matches any of the identifiers, extract the balances
-                capacity = int(asset.get("capacity", 0))
-                local_balance = int(asset.get("local_balance", 0))
-                remote_balance = int(asset.get("remote_balance", 0))
+            # tapd always reports all three balances for a channel asset
+            capacity = asset["capacity"]
+            local_balance = asset["local_balance"]
+            remote_balance = asset["remote_balance"]
+
+            # lnd embeds tapd's channel data with plain JSON numbers, which decode
+            # to ints already; only convert if they were encoded as strings
+            if isinstance(capacity, str):
+                capacity = int(capacity)
+                local_balance = int(local_balance)
+                remote_balance = int(remote_balance)
+
+            total_capacity, total_local, total_remote = index.get(asset_id, (0, 0, 0))
+            index[asset_id] = (
+                total_capacity + capacity,
+                total_local + local_balance,
+                total_remote + remote_balance,
+            )
+
+    return index
+
 
-                # Accumulate the totals
-                total_capacity += capacity
-                total_local_balance += local_balance
-                total_remote_balance += remote_balance
+def get_off_chain_balances(channel_index, asset_ids):
+    """
+    Returns the total off-chain capacity, local balance, and remote balance of the
+    given asset IDs from a channel index built by `build_channel_index`.
+    """
+    matches = [channel_index[a] for a in set(asset_ids) if a in channel_index]
+
+    total_capacity = sum(m[0] for m in matches)
+    total_local_balance = sum(m[1] for m in matches)
+    total_remote_balance = sum(m[2] for m in matches)
 
     # print(f"Off-chain total capacity: {total_capacity}")
     # print(f"Off-chain total local balance: {total_local_balance}")
@@ -123,24 +388,16 @@ def get_off_chain_balances(identifier, id_type, network, asset_ids=None):
     return total_capacity, total_local_balance, total_remote_balance
 
 
-def list_assets(group_key, network):
+def resolve_group(data, group_key):
     """
-    Runs a CLI command to list all assets associated with a group key and returns a list of asset IDs.
+    Walks the `tapcli assets list` output once and returns the list of distinct asset
+    IDs associated with a group key together with their total on-chain balance.
     """
-    list_assets_command = [
-        "tapcli",
-        "--tlscertpath",
-        "~/.lit/tls.cert",
-        f"--rpcserver=localhost:8443",
-        f"--network={network}",
-        "assets",
-        "list",
-    ]
-
-    data = run_command(list_assets_command)
-
-    # Initialize an empty list to collect asset IDs
-    asset_ids = []
+    # Collect asset IDs in an insertion-ordered dict, since the same asset ID shows
+    # up once per UTXO. Every UTXO has to be visited to sum the on-chain total, so
+    # the walk cannot stop early.
+    asset_ids = {}
+    onchain_total = 0
 
     # Iterate over the assets in the returned data
     for asset in data.get("assets", []):
@@ -155,71 +412,163 @@ def list_assets(group_key, network):
             if raw_group_key == group_key or tweaked_group_key == group_key:
                 asset_id = asset.get("asset_genesis", {}).get("asset_id")
                 if asset_id:
-                    asset_ids.append(asset_id)
-
-    # Return the list of matched asset IDs
-    return asset_ids
-
-
-# Main program starts here
-
-# Check if the correct number of arguments was provided
-if len(sys.argv) != 3:
-    print("Error: Both identifier (asset ID or group key) and network are required.")
-    print("Usage: python3 chain-balance.py <identifier> <network>")
-    sys.exit(1)
-
-# Identifier (can be either asset ID or group key) and network (e.g., testnet, mainnet, regtest)
-identifier = sys.argv[1]
-network = sys.argv[2]
-
-# Determine if the identifier is an asset ID or a group key
-if len(identifier) == 64:
-    id_type = "asset_id"
-    asset_ids = [identifier]  # Single asset ID in a list
-elif len(identifier) == 66:
-    id_type = "group_key"
-    # Retrieve all asset IDs linked to the group key
-    asset_ids = list_assets(identifier, network)
-    print(f"Found {len(asset_ids)} assets linked to group key {identifier}.")
-else:
-    print(
-        "Error: Invalid identifier length. Asset ID should be 64 characters and group key should be 66 characters."
+                    asset_ids[asset_id] = None
+
+                if asset.get("script_key_is_local", False):
+                    onchain_total += int(asset.get("amount", 0))
+
+    # Return the list of matched asset IDs and their on-chain balance
+    return list(asset_ids), onchain_total
+
+
+# Identifier types by decoded length: asset IDs are 32 bytes, group keys are
+# 33-byte compressed public keys
+ID_TYPES = {32: "asset_id", 33: "group_key"}
+
+
+def parse_identifier(identifier):
+    """
+    Decodes a hex identifier and returns it in lowercase (as tapd reports it)
+    together with its type, or None if it is not a valid asset ID or group key.
+    """
+    try:
+        raw = bytes.fromhex(identifier)
+    except ValueError:
+        return None
+
+    # bytes.fromhex skips whitespace, so also require exactly two digits per byte
+    id_type = ID_TYPES.get(len(raw))
+    if id_type is None or len(identifier) != 2 * len(raw):
+        return None
+
+    return raw.hex(), id_type
+
+
+async def process_identifier(identifier, id_type, network):
+    """
+    Queries tapd for a single identifier and returns the asset IDs it covers and
+    their on-chain balance. The asset list is fetched once per process and shared
+    by every identifier.
+    """
+    tap_data = await fetch_assets(network)
+
+    if id_type == "asset_id":
+        return [identifier], get_onchain_balance_single(tap_data, identifier)
+
+    # Retrieve all asset IDs linked to the group key and their on-chain balance
+    return resolve_group(tap_data, identifier)
+
+
+async def main(identifiers, network, active_only=False, json_output=False):
+    # identifiers is a list of (identifier, id_type) pairs from parse_identifier.
+    # The tapd and lnd queries are independent, so run them all concurrently. The
+    # channel list is shared by every identifier.
+    outcomes = await asyncio.gather(
+        fetch_channel_index(network, active_only),
+        *(
+            process_identifier(identifier, id_type, network)
+            for identifier, id_type in identifiers
+        ),
+        return_exceptions=True,
     )
-    sys.exit(1)
 
-print(f"Calculating total balance for {id_type} {identifier} on {network}...")
+    # Let every query finish before surfacing a failure; raising while subprocess
+    # tasks are still in flight leaves asyncio.run stuck cancelling them
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            raise outcome
 
-# Initialize total balances
-total_off_chain_capacity = 0
-total_off_chain_local_balance = 0
-total_off_chain_remote_balance = 0
+    channel_index, *results = outcomes
 
-# Iterate over each asset ID and accumulate balances
-simple_balance = 0
-simple_balance += get_onchain_balance(identifier, id_type, network)
+    balances = {}
 
-# Process off-chain balances for either a single asset ID or multiple asset IDs
-total_capacity, total_local_balance, total_remote_balance = get_off_chain_balances(
-    identifier,
-    id_type,
-    network,
-    asset_ids=asset_ids if id_type == "group_key" else None,
-)
+    for (identifier, id_type), (asset_ids, simple_balance) in zip(identifiers, results):
+        # Process off-chain balances for either a single asset ID or multiple asset IDs
+        total_capacity, total_local_balance, total_remote_balance = (
+            get_off_chain_balances(channel_index, asset_ids)
+        )
+
+        # Calculate final balances
+        total_on_chain_balance = simple_balance
+        total_offchain_funds = total_capacity
+        total_balance = total_on_chain_balance + total_local_balance
+
+        if json_output:
+            balances[identifier] = {
+                "id_type": id_type,
+                "asset_ids": asset_ids,
+                "on_chain_balance": total_on_chain_balance,
+                "off_chain_capacity": total_offchain_funds,
+                "off_chain_local_balance": total_local_balance,
+                "off_chain_remote_balance": total_remote_balance,
+                "total_balance": total_balance,
+            }
+            continue
+
+        if id_type == "group_key":
+            print(f"Found {len(asset_ids)} assets linked to group key {identifier}.")
+
+        print(f"Calculating total balance for {id_type} {identifier} on {network}...")
+
+        if simple_balance > 0:
+            print(f"Found on-chain balance")
+        else:
+            print(
+                f"No on-chain balance information found for {id_type} {identifier} on {network}."
+            )
+
+        # Output the total balances
+        print(f"----Totals----")
+        print(f"On-chain balance: {total_on_chain_balance}")
+        print(f"Off-chain capacity: {total_offchain_funds}")
+        print(f"Off-chain local balance: {total_local_balance}")
+        print(f"Total balance: {total_balance}")
+
+    if json_output:
+        print(json.dumps({"network": network, "balances": balances}))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Calculate the total on-chain and off-chain balance of Taproot "
+        "Assets by asset ID or group key."
+    )
+    parser.add_argument(
+        "identifiers",
+        nargs="+",
+        metavar="identifier",
+        help="asset ID (64 hex characters) or group key (66 hex characters)",
+    )
+    parser.add_argument("network", help="network, e.g. mainnet, testnet or regtest")
+    # Inactive channels (e.g. with an offline peer) still hold asset balances, so
+    # filtering them out is opt-in
+    parser.add_argument(
+        "--active-only",
+        action="store_true",
+        help="only count channels that are currently active",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="print all balances as a single JSON object, keyed by identifier in "
+        "lowercase hex",
+    )
+    args = parser.parse_args()
+
+    # Keep stdout parseable in JSON mode by reporting errors on stderr
+    error_output = sys.stderr if args.json else sys.stdout
+
+    # Validate every identifier before querying the node
+    identifiers = [parse_identifier(identifier) for identifier in args.identifiers]
+    if None in identifiers:
+        print(
+            "Error: Invalid identifier. Asset ID should be 64 hex characters and group key should be 66 hex characters.",
+            file=error_output,
+        )
+        sys.exit(1)
 
-# Update total balances
-total_off_chain_capacity += total_capacity
-total_off_chain_local_balance += total_local_balance
-total_off_chain_remote_balance += total_remote_balance
-
-# Calculate final balances
-total_on_chain_balance = simple_balance
-total_offchain_funds = total_off_chain_capacity
-total_balance = total_on_chain_balance + total_off_chain_local_balance
-
-# Output the total balances
-print(f"----Totals----")
-print(f"On-chain balance: {total_on_chain_balance}")
-print(f"Off-chain capacity: {total_offchain_funds}")
-print(f"Off-chain local balance: {total_off_chain_local_balance}")
-print(f"Total balance: {total_balance}")
+    try:
+        asyncio.run(main(identifiers, args.network, args.active_only, args.json))
+    except CommandError as e:
+        print(e, file=error_output)
+        sys.exit(1)